@@ -17,19 +17,97 @@ Requirements:
 """
 
 import argparse
+import ctypes
+import errno
+import logging
+import os
+import select
 import signal
+import socket
+import struct
 import sys
 import time
 import can
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import List, Dict
+from typing import List, Dict, Union
 
 
 # CAN Protocol Constants
 CAN_BASE_ID = 0x781
 CAN_BROADCAST_ID = 0x780
 
+logger = logging.getLogger('can_device_simulator')
+
+# Frankly message layout: request (u16), result (u8), packet ID (u8), data (u32), little endian
+_FMT = struct.Struct('<HBBI')
+
+# Linux struct can_frame: can_id (u32), len (u8), 3 bytes padding, data (8 bytes)
+_CAN_FRAME = struct.Struct('=IB3x8s')
+# Linux struct can_filter: can_id (u32), can_mask (u32)
+_CAN_FILTER = struct.Struct('=II')
+# CAN_RAW socket options from linux/can/raw.h (not all are exported by the socket module)
+_CAN_RAW_ERR_FILTER = getattr(socket, 'CAN_RAW_ERR_FILTER', 2)
+_CAN_RAW_RECV_OWN_MSGS = getattr(socket, 'CAN_RAW_RECV_OWN_MSGS', 4)
+
+# Max. number of frames drained from the RX queue per recvmmsg() call
+_RX_BATCH = 32
+
+
+class _IOVec(ctypes.Structure):
+    """Linux struct iovec"""
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    """Linux struct msghdr"""
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(_IOVec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    """Linux struct mmsghdr"""
+    _fields_ = [('msg_hdr', _MsgHdr), ('msg_len', ctypes.c_uint)]
+
+
+class _FrameVector:
+    """Contiguous buffer of CAN frames with one mmsghdr per frame, for recvmmsg()/sendmmsg()"""
+
+    def __init__(self, count: int):
+        self.buf = bytearray(_CAN_FRAME.size * count)
+        self._c_buf = (ctypes.c_char * len(self.buf)).from_buffer(self.buf)
+        self._iovecs = (_IOVec * count)()
+        self.hdrs = (_MMsgHdr * count)()
+
+        base = ctypes.addressof(self._c_buf)
+        for idx in range(count):
+            self._iovecs[idx].iov_base = base + idx * _CAN_FRAME.size
+            self._iovecs[idx].iov_len = _CAN_FRAME.size
+            self.hdrs[idx].msg_hdr.msg_iov = ctypes.pointer(self._iovecs[idx])
+            self.hdrs[idx].msg_hdr.msg_iovlen = 1
+
+
+if hasattr(socket, 'AF_CAN'):
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _libc.recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint,
+                               ctypes.c_int, ctypes.c_void_p]
+    _libc.recvmmsg.restype = ctypes.c_int
+    _libc.sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    _libc.sendmmsg.restype = ctypes.c_int
+
+
+def _raise_errno():
+    """Raise the errno of the last failed libc call as OSError"""
+    err = ctypes.get_errno()
+    raise OSError(err, os.strerror(err))
+
 
 class RequestType(IntEnum):
     """Frankly Bootloader Request Types"""
@@ -64,9 +142,33 @@ class ResultType(IntEnum):
     ERR_INVLD_ARG = 0xF9
 
 
+# Device info entry returned for each supported request type
+_REQ_TO_KEY: Dict[int, str] = {
+    RequestType.PING: 'bootloader_version',
+    RequestType.DEV_INFO_BOOTLOADER_VERSION: 'bootloader_version',
+    RequestType.DEV_INFO_BOOTLOADER_CRC: 'bootloader_crc',
+    RequestType.DEV_INFO_VID: 'vid',
+    RequestType.DEV_INFO_PID: 'pid',
+    RequestType.DEV_INFO_PRD: 'prd',
+    RequestType.DEV_INFO_UID1: 'uid1',
+    RequestType.DEV_INFO_UID2: 'uid2',
+    RequestType.DEV_INFO_UID3: 'uid3',
+    RequestType.DEV_INFO_UID4: 'uid4',
+    RequestType.FLASH_INFO_START_ADDR: 'flash_start_addr',
+    RequestType.FLASH_INFO_PAGE_SIZE: 'flash_page_size',
+    RequestType.FLASH_INFO_NUM_PAGES: 'flash_num_pages',
+    RequestType.APP_INFO_PAGE_IDX: 'app_page_idx',
+    RequestType.APP_INFO_CRC_CALC: 'app_crc_calc',
+}
+_SUPPORTED_REQS = frozenset(int(r) for r in _REQ_TO_KEY)
+_REQ_NAME: Dict[int, str] = {int(r): r.name for r in RequestType}
+
+
 @dataclass
 class FranklyMessage:
     """Represents a Frankly Bootloader message (8 bytes)"""
+    __slots__ = ('request', 'result', 'packet_id', 'data')
+
     request: int  # 2 bytes
     result: int   # 1 byte
     packet_id: int  # 1 byte
@@ -74,20 +176,12 @@ class FranklyMessage:
 
     def to_bytes(self) -> bytes:
         """Convert message to 8-byte array"""
-        msg = bytearray(8)
-        # Request type (little endian, 2 bytes)
-        msg[0] = self.request & 0xFF
-        msg[1] = (self.request >> 8) & 0xFF
-        # Result type (1 byte)
-        msg[2] = self.result & 0xFF
-        # Packet ID (1 byte)
-        msg[3] = self.packet_id & 0xFF
-        # Data (little endian, 4 bytes)
-        msg[4] = (self.data >> 0) & 0xFF
-        msg[5] = (self.data >> 8) & 0xFF
-        msg[6] = (self.data >> 16) & 0xFF
-        msg[7] = (self.data >> 24) & 0xFF
-        return bytes(msg)
+        return _FMT.pack(
+            self.request & 0xFFFF,
+            self.result & 0xFF,
+            self.packet_id & 0xFF,
+            self.data & 0xFFFFFFFF
+        )
 
     @classmethod
     def from_bytes(cls, data: bytes) -> 'FranklyMessage':
@@ -95,10 +189,7 @@ class FranklyMessage:
         if len(data) != 8:
             raise ValueError(f"Invalid message length: {len(data)}, expected 8")
 
-        request = data[0] | (data[1] << 8)
-        result = data[2]
-        packet_id = data[3]
-        msg_data = data[4] | (data[5] << 8) | (data[6] << 16) | (data[7] << 24)
+        request, result, packet_id, msg_data = _FMT.unpack_from(data)
 
         return cls(request=request, result=result, packet_id=packet_id, data=msg_data)
 
@@ -106,13 +197,25 @@ class FranklyMessage:
 @dataclass
 class SimulatedDevice:
     """Configuration for a single simulated device"""
+    __slots__ = ('node_id', 'tx_can_id', 'device_info', 'response_templates', 'tx_msg',
+                 'rx_prefix', 'tx_prefix')
+
     node_id: int
     tx_can_id: int
     device_info: Dict[str, int]
+    response_templates: Dict[int, Union[bytes, bytearray]]
+    tx_msg: can.Message
+    rx_prefix: str
+    tx_prefix: str
 
     @classmethod
-    def create(cls, node_id: int) -> 'SimulatedDevice':
-        """Create a device with default configuration"""
+    def create(cls, node_id: int, ignore_packet_id: bool = False) -> 'SimulatedDevice':
+        """Create a device with default configuration
+
+        Args:
+            node_id: Device node ID (0-255)
+            ignore_packet_id: Respond with packet ID 0 instead of echoing the request's packet ID
+        """
         tx_can_id = CAN_BASE_ID + (node_id * 2) + 1
 
         # Generate unique UIDs based on node ID
@@ -133,28 +236,64 @@ class SimulatedDevice:
             'app_crc_calc': 0x00000000,      # Calculated CRC of app area
         }
 
-        return cls(node_id=node_id, tx_can_id=tx_can_id, device_info=device_info)
+        # Device info is static, so pre-pack the OK response of every supported request.
+        # Only the packet ID (byte 3) has to be patched before sending, unless it is
+        # ignored: then the frame never changes and is kept as immutable bytes.
+        response_templates = {}
+        for request, key in _REQ_TO_KEY.items():
+            buf = bytearray(_FMT.size)
+            _FMT.pack_into(buf, 0, request, ResultType.OK, 0, device_info[key])
+            response_templates[int(request)] = bytes(buf) if ignore_packet_id else buf
+
+        # Reused for every response, only the payload changes between frames
+        tx_msg = can.Message(arbitration_id=tx_can_id, data=bytes(8), is_extended_id=False, dlc=8)
+
+        return cls(node_id=node_id, tx_can_id=tx_can_id, device_info=device_info,
+                   response_templates=response_templates, tx_msg=tx_msg,
+                   rx_prefix=f"[RX] Node {node_id}: ", tx_prefix=f"[TX] Node {node_id}: ")
 
 
 class CANDeviceSimulator:
     """Simulates one or more CAN devices for Frankly Bootloader"""
 
-    def __init__(self, interface: str, node_ids: List[int]):
+    def __init__(self, interface: str, node_ids: List[int], bustype: str = 'socketcan',
+                 ignore_packet_id: bool = False):
         """
         Initialize the simulator
 
         Args:
             interface: CAN interface name (e.g., 'vcan0', 'can0')
             node_ids: List of device node IDs (0-255)
+            bustype: python-can interface type, 'socketcan' uses a raw socket instead
+            ignore_packet_id: Respond to supported requests with packet ID 0
+                              instead of echoing the request's packet ID
         """
         self.interface = interface
+        self.bustype = bustype
+        self.ignore_packet_id = ignore_packet_id
         self.bus = None
+        self.sock = None
         self.running = False
 
+        # Backend specific, set up when the bus is opened in start()
+        self._recv_payloads = None
+        self._send_responses = None
+        self._rx_frames = None
+        self._tx_frames = None
+        self._static_tx_frames = None
+        # Snapshot of the log level for RX/TX traffic, refreshed when run_loop() or
+        # handle_message() starts so the per-frame check is a plain attribute read
+        self._log_traffic = logger.isEnabledFor(logging.INFO)
+
         # Create simulated devices
         self.devices: Dict[int, SimulatedDevice] = {}
         for node_id in node_ids:
-            self.devices[node_id] = SimulatedDevice.create(node_id)
+            self.devices[node_id] = SimulatedDevice.create(node_id, ignore_packet_id)
+
+        # Devices never change after startup, this fixes the response order on the hot path
+        self._device_list: List[SimulatedDevice] = list(self.devices.values())
+        # Reused rejection frame for unsupported requests
+        self._rejection = bytearray(_FMT.size)
 
         # RX ID: CAN_BROADCAST_ID (all devices listen to broadcast)
         self.rx_can_id = CAN_BROADCAST_ID
@@ -190,13 +329,10 @@ class CANDeviceSimulator:
     def start(self):
         """Start the simulator"""
         try:
-            # Create CAN bus connection
-            self.bus = can.interface.Bus(channel=self.interface, bustype='socketcan')
-            print(f"Connected to {self.interface}")
-
-            # Set up CAN filters to only receive broadcast messages
-            filters = [{"can_id": self.rx_can_id, "can_mask": 0x7FF, "extended": False}]
-            self.bus.set_filters(filters)
+            if self.bustype == 'socketcan':
+                self._open_raw_socket()
+            else:
+                self._open_python_can()
             print(f"Listening for messages on CAN ID 0x{self.rx_can_id:03X}")
             print("Press Ctrl+C to stop\n")
 
@@ -213,17 +349,128 @@ class CANDeviceSimulator:
             print(f"Error: {e}")
             sys.exit(1)
 
+    def _open_raw_socket(self):
+        """Open a raw SocketCAN socket, bypassing python-can on the hot path"""
+        if not hasattr(socket, 'AF_CAN'):
+            raise OSError("SocketCAN is not available on this platform, select another --bustype")
+
+        self.sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+
+        # Kernel filter: only standard broadcast frames reach user space
+        can_mask = socket.CAN_SFF_MASK | socket.CAN_EFF_FLAG | socket.CAN_RTR_FLAG
+        self.sock.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER,
+                             _CAN_FILTER.pack(self.rx_can_id, can_mask))
+        # Neither error frames nor our own responses are of interest
+        self.sock.setsockopt(socket.SOL_CAN_RAW, _CAN_RAW_ERR_FILTER, struct.pack('=I', 0))
+        self.sock.setsockopt(socket.SOL_CAN_RAW, _CAN_RAW_RECV_OWN_MSGS, struct.pack('=i', 0))
+        self.sock.bind((self.interface,))
+        self._rx_frames = _FrameVector(_RX_BATCH)
+
+        # One TX frame per device, in device order, so all responses go out with one sendmmsg()
+        self._tx_frames = _FrameVector(len(self._device_list))
+        for idx, device in enumerate(self._device_list):
+            _CAN_FRAME.pack_into(self._tx_frames.buf, idx * _CAN_FRAME.size, device.tx_can_id, 8, bytes(8))
+
+        # Without packet ID echo the whole TX block of each supported request is constant,
+        # so it is built once and handed to sendmmsg() as is
+        if self.ignore_packet_id:
+            self._static_tx_frames = {}
+            for request in _SUPPORTED_REQS:
+                frames = _FrameVector(len(self._device_list))
+                for idx, device in enumerate(self._device_list):
+                    _CAN_FRAME.pack_into(frames.buf, idx * _CAN_FRAME.size, device.tx_can_id, 8,
+                                         device.response_templates[request])
+                self._static_tx_frames[request] = frames
+        print(f"Connected to {self.interface} (raw SocketCAN)")
+
+        self._recv_payloads = self._recv_raw
+        self._send_responses = self._send_raw
+
+    def _open_python_can(self):
+        """Open the CAN bus through python-can, for interface types other than socketcan"""
+        self.bus = can.interface.Bus(channel=self.interface, bustype=self.bustype)
+        print(f"Connected to {self.interface} ({self.bustype})")
+
+        # Set up CAN filters to only receive standard broadcast messages, python-can
+        # applies them in software if the interface cannot filter itself
+        filters = [{"can_id": self.rx_can_id, "can_mask": 0x7FF, "extended": False}]
+        self.bus.set_filters(filters)
+
+        self._recv_payloads = self._recv_python_can
+        self._send_responses = self._send_python_can
+
     def stop(self):
         """Stop the simulator"""
         self.running = False
+        if self.sock:
+            self.sock.close()
         if self.bus:
             self.bus.shutdown()
+        if self.sock or self.bus:
             print("\nSimulator stopped")
 
+    def _recv_raw(self) -> List[bytes]:
+        """Drain all queued broadcast frames from the raw socket (1 second timeout)"""
+        ready, _, _ = select.select([self.sock], [], [], 1.0)
+        if not ready:
+            return []
+
+        # One syscall for up to _RX_BATCH frames
+        num_frames = _libc.recvmmsg(self.sock.fileno(), self._rx_frames.hdrs, _RX_BATCH,
+                                    socket.MSG_DONTWAIT, None)
+        if num_frames < 0:
+            if ctypes.get_errno() in (errno.EAGAIN, errno.EINTR):
+                return []
+            _raise_errno()
+
+        payloads = []
+        for idx in range(num_frames):
+            _, length, data = _CAN_FRAME.unpack_from(self._rx_frames.buf, idx * _CAN_FRAME.size)
+            payloads.append(data[:length])
+        return payloads
+
+    def _send_raw(self, payloads: List[bytes]):
+        """Send the response payloads of all devices (in device order) with one sendmmsg() call"""
+        buf = self._tx_frames.buf
+        for idx, payload in enumerate(payloads):
+            offset = idx * _CAN_FRAME.size + 8
+            buf[offset:offset + 8] = payload
+
+        self._send_frames(self._tx_frames, len(payloads))
+
+    def _send_frames(self, frames: _FrameVector, count: int):
+        """Send the first count frames of a frame vector with sendmmsg()"""
+        num_sent = 0
+        while num_sent < count:
+            ret = _libc.sendmmsg(self.sock.fileno(), ctypes.byref(frames.hdrs[num_sent]),
+                                 count - num_sent, 0)
+            if ret < 0:
+                _raise_errno()
+            num_sent += ret
+
+    def _recv_python_can(self) -> List[bytes]:
+        """Receive one broadcast frame through python-can (1 second timeout)"""
+        can_msg = self.bus.recv(timeout=1.0)
+
+        # The bus filters guarantee this is a broadcast message
+        return [can_msg.data] if can_msg is not None else []
+
+    def _send_python_can(self, payloads: List[bytes]):
+        """Send the response payloads of all devices (in device order) through python-can"""
+        for device, payload in zip(self._device_list, payloads):
+            # send() is done with the message once it returns, so it can be reused right away
+            device.tx_msg.data = payload
+            self.bus.send(device.tx_msg)
+
     def handle_message(self, msg: FranklyMessage, device: SimulatedDevice) -> FranklyMessage:
         """
         Process a received message and generate response for a specific device
 
+        Per-device API around the same response logic run_loop() uses for broadcasts.
+        Like a sent frame, the request is truncated to 16 bit and the packet ID to 8 bit.
+        Supported requests patch the packet ID into the device's cached response, which
+        the broadcast path rewrites before every send anyway.
+
         Args:
             msg: Received Frankly message
             device: The simulated device to respond
@@ -231,108 +478,104 @@ class CANDeviceSimulator:
         Returns:
             Response message
         """
-        request_name = self._get_request_name(msg.request)
-        print(f"[RX] Node {device.node_id}: {request_name} (0x{msg.request:04X}), Packet ID: {msg.packet_id}")
-
-        # Default response: echo request, set result to OK
-        response = FranklyMessage(
-            request=msg.request,
-            result=ResultType.OK,
-            packet_id=msg.packet_id,
-            data=0
-        )
+        # Not on the hot path, so pick up logging configured after construction
+        self._log_traffic = logger.isEnabledFor(logging.INFO)
 
-        info = device.device_info
-
-        # Handle different request types
-        if msg.request == RequestType.PING:
-            response.data = info['bootloader_version']
-        elif msg.request == RequestType.DEV_INFO_BOOTLOADER_VERSION:
-            response.data = info['bootloader_version']
-        elif msg.request == RequestType.DEV_INFO_BOOTLOADER_CRC:
-            response.data = info['bootloader_crc']
-        elif msg.request == RequestType.DEV_INFO_VID:
-            response.data = info['vid']
-        elif msg.request == RequestType.DEV_INFO_PID:
-            response.data = info['pid']
-        elif msg.request == RequestType.DEV_INFO_PRD:
-            response.data = info['prd']
-        elif msg.request == RequestType.DEV_INFO_UID1:
-            response.data = info['uid1']
-        elif msg.request == RequestType.DEV_INFO_UID2:
-            response.data = info['uid2']
-        elif msg.request == RequestType.DEV_INFO_UID3:
-            response.data = info['uid3']
-        elif msg.request == RequestType.DEV_INFO_UID4:
-            response.data = info['uid4']
-        elif msg.request == RequestType.FLASH_INFO_START_ADDR:
-            response.data = info['flash_start_addr']
-        elif msg.request == RequestType.FLASH_INFO_PAGE_SIZE:
-            response.data = info['flash_page_size']
-        elif msg.request == RequestType.FLASH_INFO_NUM_PAGES:
-            response.data = info['flash_num_pages']
-        elif msg.request == RequestType.APP_INFO_PAGE_IDX:
-            response.data = info['app_page_idx']
-        elif msg.request == RequestType.APP_INFO_CRC_CALC:
-            response.data = info['app_crc_calc']
+        request = msg.request & 0xFFFF
+        packet_id = msg.packet_id & 0xFF
+
+        if request in _SUPPORTED_REQS:
+            response = self._respond(device, request, packet_id)
         else:
-            # Unsupported request
-            response.result = ResultType.ERR_NOT_SUPPORTED
-            print(f"[  ] Node {device.node_id}: Unsupported request type: 0x{msg.request:04X}")
+            response = self._reject(request, packet_id, f"Node {device.node_id}")
 
-        return response
+        return FranklyMessage.from_bytes(response)
 
     def run_loop(self):
         """Main message processing loop"""
-        while self.running:
-            try:
-                # Wait for CAN message (1 second timeout)
-                can_msg = self.bus.recv(timeout=1.0)
-
-                if can_msg is None:
-                    continue
+        # Evaluated once per loop, logging is configured by now
+        self._log_traffic = logger.isEnabledFor(logging.INFO)
 
-                # Verify this is a broadcast message
-                if can_msg.arbitration_id != self.rx_can_id:
-                    continue
-
-                # Parse Frankly message
+        consecutive_errors = 0
+        try:
+            while self.running:
+                # Wait for broadcast messages
                 try:
-                    frankly_msg = FranklyMessage.from_bytes(can_msg.data)
-                except ValueError as e:
-                    print(f"[!!] Invalid message: {e}")
+                    payloads = self._recv_payloads()
+                    consecutive_errors = 0
+                except (can.CanError, OSError) as e:
+                    consecutive_errors = self._back_off(consecutive_errors, e)
                     continue
 
-                # Each device responds to the broadcast message
-                for node_id, device in self.devices.items():
-                    # Generate response for this device
-                    response = self.handle_message(frankly_msg, device)
-
-                    # Send response on device's TX ID
-                    response_can = can.Message(
-                        arbitration_id=device.tx_can_id,
-                        data=response.to_bytes(),
-                        is_extended_id=False
-                    )
+                # The frames are already off the kernel queue, so errors are handled per frame
+                # and a failed send does not drop the rest of the batch
+                for payload in payloads:
+                    try:
+                        self._handle_broadcast(payload)
+                    except (can.CanError, OSError) as e:
+                        consecutive_errors = self._back_off(consecutive_errors, e)
 
-                    self.bus.send(response_can)
-                    print(f"[TX] Node {node_id}: Result={ResultType(response.result).name}, Data=0x{response.data:08X}")
+        except KeyboardInterrupt:
+            pass
 
-                print()  # Empty line after all devices respond
-
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                print(f"Error in message loop: {e}")
-                time.sleep(0.1)
+    @staticmethod
+    def _back_off(consecutive_errors: int, error: Exception) -> int:
+        """Log a bus error and wait, exponentially longer while errors keep repeating"""
+        # The counter is capped where the delay reaches its 100 ms limit
+        consecutive_errors = min(consecutive_errors + 1, 7)
+        logger.error("Error in message loop: %s", error)
+        time.sleep(min(0.1, 0.001 * 2 ** consecutive_errors))
+        return consecutive_errors
+
+    def _handle_broadcast(self, payload: bytes):
+        """Let every simulated device respond to a received broadcast message"""
+        # Parse Frankly message into locals, no FranklyMessage needed on the hot path
+        if len(payload) != _FMT.size:
+            logger.warning("[!!] Invalid message: Invalid message length: %d, expected 8", len(payload))
+            return
+        request, _, packet_id, _ = _FMT.unpack_from(payload)
+
+        # Unsupported requests are rejected identically by every device,
+        # so the rejection frame is built once per broadcast
+        if request not in _SUPPORTED_REQS:
+            self._send_responses([self._reject(request, packet_id)] * len(self._device_list))
+            return
+
+        # Raw socket with --ignore-packet-id: send the prebuilt frames without any copy
+        if self._static_tx_frames is not None:
+            if self._log_traffic:
+                for device in self._device_list:
+                    self._respond(device, request, packet_id)
+            self._send_frames(self._static_tx_frames[request], len(self._device_list))
+            return
+
+        # Each device responds to the broadcast message on its TX ID
+        self._send_responses([self._respond(device, request, packet_id)
+                              for device in self._device_list])
+
+    def _respond(self, device: SimulatedDevice, request: int, packet_id: int) -> Union[bytes, bytearray]:
+        """Get the cached response of a device to a supported request, echoing the packet ID"""
+        template = device.response_templates[request]
+        if not self.ignore_packet_id:
+            template[3] = packet_id
+        if self._log_traffic:
+            logger.info("%s%s (0x%04X), Packet ID: %d", device.rx_prefix,
+                        self._get_request_name(request), request, packet_id)
+            logger.info("%sResult=OK, Data=0x%08X", device.tx_prefix, _FMT.unpack_from(template)[3])
+        return template
+
+    def _reject(self, request: int, packet_id: int, node_label: str = "All nodes") -> bytearray:
+        """Get the ERR_NOT_SUPPORTED response to an unsupported request, shared by all devices"""
+        if self._log_traffic:
+            logger.info("[  ] %s: Unsupported request type: 0x%04X, Packet ID: %d",
+                        node_label, request, packet_id)
+        _FMT.pack_into(self._rejection, 0, request, ResultType.ERR_NOT_SUPPORTED, packet_id, 0)
+        return self._rejection
 
     @staticmethod
     def _get_request_name(request_type: int) -> str:
         """Get human-readable name for request type"""
-        try:
-            return RequestType(request_type).name
-        except ValueError:
-            return f"UNKNOWN(0x{request_type:04X})"
+        return _REQ_NAME.get(request_type, f"UNKNOWN(0x{request_type:04X})")
 
 
 def main():
@@ -363,6 +606,14 @@ Examples:
         help='CAN interface name (default: vcan0)'
     )
 
+    parser.add_argument(
+        '--bustype',
+        type=str,
+        default='socketcan',
+        help='python-can interface type, e.g. pcan, slcan or virtual (default: socketcan, '
+             'which is served through a raw SocketCAN socket)'
+    )
+
     parser.add_argument(
         '--node-id',
         type=int,
@@ -376,8 +627,25 @@ Examples:
         help='Multiple device node IDs, 0-255 (e.g., --node-ids 1 3 5 8)'
     )
 
+    parser.add_argument(
+        '--ignore-packet-id',
+        action='store_true',
+        help='Answer supported requests with packet ID 0 instead of echoing it '
+             '(only for hosts that do not check packet IDs)'
+    )
+
+    parser.add_argument(
+        '--log-level',
+        type=str.upper,
+        default='WARNING',
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        help='Log level, INFO shows every RX/TX frame (default: WARNING)'
+    )
+
     args = parser.parse_args()
 
+    logging.basicConfig(level=args.log_level, format='%(message)s')
+
     # Determine which node IDs to use
     node_ids = []
     if args.node_ids:
@@ -400,7 +668,7 @@ Examples:
         sys.exit(1)
 
     # Create and start simulator
-    simulator = CANDeviceSimulator(args.interface, node_ids)
+    simulator = CANDeviceSimulator(args.interface, node_ids, args.bustype, args.ignore_packet_id)
 
     # Set up signal handler for clean shutdown
     def signal_handler(sig, frame):